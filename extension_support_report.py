@@ -3,12 +3,81 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import argparse
+import re
+
 from openxr_inventory.extensions import generate_runtime_report, generate_client_report
-from openxr_inventory.runtime_inventory import load_all_runtimes
-from openxr_inventory.client_inventory import load_all_clients
+from openxr_inventory.inventory_filter import InventoryFilter, parse_category
+from openxr_inventory.runtime_inventory import load_all_runtimes, filter_runtimes
+from openxr_inventory.client_inventory import load_all_clients, filter_clients
+
+
+def _parse_variant(arg: str):
+    name, sep, spec = arg.partition(":")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError("expected NAME:SPEC, got '%s'" % arg)
+    # The name becomes part of the output file names, keep it to a safe file name stem
+    if not re.fullmatch(r"[A-Za-z0-9_.-]+", name) or name.strip(".") == "":
+        raise argparse.ArgumentTypeError(
+            "invalid variant name '%s', use only letters, digits, '_', '.' and '-'" % name
+        )
+    try:
+        return name, InventoryFilter.from_spec(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _parse_category(arg: str) -> int:
+    try:
+        return parse_category(arg)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
 
 if __name__ == "__main__":
-    runtimes = load_all_runtimes()
-    clients = load_all_clients()
+    parser = argparse.ArgumentParser(
+        description="Generate the OpenXR runtime and client extension support reports."
+    )
+    parser.add_argument("--vendor", action="append", default=[],
+                        help="Only load entries whose vendor matches this glob (case-insensitive). May be repeated.")
+    parser.add_argument("--platform", action="append", default=[],
+                        help="Only load entries for a platform matching this glob (case-insensitive). May be repeated.")
+    parser.add_argument("--stub", action="append", default=[],
+                        help="Only load inventory files whose name stem matches this glob. May be repeated.")
+    parser.add_argument("--category", action="append", default=[], type=_parse_category,
+                        help="Only keep extensions of this category: KHR, EXT, VENDOR, KHX, EXTX or VENDORX. May be repeated.")
+    parser.add_argument("--variant", action="append", default=[], type=_parse_variant, metavar="NAME:SPEC",
+                        help="Additionally write reports suffixed with _NAME for the subset selected by SPEC, "
+                             "a ';'-separated list of vendor=, platform=, stub= and category= items. "
+                             "All variants share a single load. May be repeated.")
+    args = parser.parse_args()
+
+    variant_names = [name for name, _ in args.variant]
+    duplicates = sorted({name for name in variant_names if variant_names.count(name) > 1})
+    if duplicates:
+        parser.error("duplicate variant name(s): %s" % ", ".join(duplicates))
+
+    load_filter = InventoryFilter(
+        vendors=args.vendor,
+        platforms=args.platform,
+        stubs=args.stub,
+        categories=args.category,
+    )
+    runtimes = load_all_runtimes(inventory_filter=load_filter)
+    clients = load_all_clients(inventory_filter=load_filter)
     generate_runtime_report(runtimes, clients)
     generate_client_report(runtimes, clients)
+
+    for name, variant_filter in args.variant:
+        variant_runtimes = filter_runtimes(runtimes, variant_filter)
+        variant_clients = filter_clients(clients, variant_filter)
+        generate_runtime_report(
+            variant_runtimes,
+            variant_clients,
+            out_filename="public/runtime_extension_support_{}.html".format(name),
+        )
+        generate_client_report(
+            variant_runtimes,
+            variant_clients,
+            out_filename="public/client_extension_support_{}.html".format(name),
+        )
@@ -4,11 +4,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
 from .inventory_data import ExtensionEntry, EnvironmentBlendModeEntry, ViewConfigurationEntry, FormFactorEntry
+from .inventory_filter import InventoryFilter, read_header_text, scan_header
 
 @dataclass
 class ComponentEntry:
@@ -57,6 +58,9 @@ class ClientData:
     vendor: str
     """The vendor's name"""
 
+    platforms: List[str]
+    """The platforms this client supports"""
+
     components: List[ComponentEntry]
     """The components"""
 
@@ -106,25 +110,69 @@ class ClientData:
             name=d["name"],
             notes=d.get("notes"),
             vendor=d["vendor"],
+            platforms=d.get("platforms", d.get("platform", [])),
             components=comps,
             form_factors=form_factors,
         )
 
 
-def load_all_clients(directory=None) -> List[ClientData]:
-    """Load all client inventory files."""
+def _filter_client(client: ClientData, inventory_filter: InventoryFilter) -> Optional[ClientData]:
+    """Return the client restricted to the filter, or None if it is filtered out entirely."""
+    if not inventory_filter.matches(client.stub, client.vendor, client.platforms):
+        return None
+    if not inventory_filter.categories:
+        return client
+    comps = [
+        replace(component, extensions=inventory_filter.filter_extensions(component.extensions))
+        for component in client.components
+    ]
+    return replace(client, components=comps)
+
+
+def filter_clients(clients: List[ClientData], inventory_filter: InventoryFilter) -> List[ClientData]:
+    """
+    Select the subset of already-loaded clients matching a filter.
+
+    Use this to derive several report variants from a single load.
+    """
+    results = []
+    for client in clients:
+        filtered = _filter_client(client, inventory_filter)
+        if filtered is not None:
+            results.append(filtered)
+    return results
+
+
+def load_all_clients(directory=None, inventory_filter: Optional[InventoryFilter] = None) -> List[ClientData]:
+    """
+    Load all client inventory files.
+
+    If 'inventory_filter' is given, files it excludes are skipped based on a scan of
+    their first few KB where possible, without being fully read or parsed.
+    """
     if not directory:
         directory = Path(__file__).parent.parent / "clients"
+    if inventory_filter is not None and inventory_filter.is_empty():
+        inventory_filter = None
 
     failures = []
     results = []
     for f in directory.glob("*.json"):
+        if inventory_filter and not inventory_filter.matches_stub(f.stem):
+            print("Skipped %s" % f.stem)
+            continue
         with open(f, "r", encoding="utf-8") as fp:
-            data = json.load(fp)
+            if inventory_filter:
+                text = read_header_text(fp)
+                if inventory_filter.rejects_header(f.stem, scan_header(text)):
+                    print("Skipped %s" % f.stem)
+                    continue
+                text += fp.read()
+            else:
+                text = fp.read()
+        data = json.loads(text)
         try:
             parsed = ClientData.from_json(f.stem, data)
-            results.append(parsed)
-            print("Loaded %s" % parsed.stub)
         except KeyError as e:
             print(
                 "Error loading %s (probably missing required property), skipping..."
@@ -132,6 +180,14 @@ def load_all_clients(directory=None) -> List[ClientData]:
             )
             print(e)
             failures.append(str(f))
+            continue
+        if inventory_filter:
+            parsed = _filter_client(parsed, inventory_filter)
+            if parsed is None:
+                print("Skipped %s" % f.stem)
+                continue
+        results.append(parsed)
+        print("Loaded %s" % parsed.stub)
     if failures:
         print(failures)
         raise RuntimeError(
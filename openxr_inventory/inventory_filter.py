@@ -0,0 +1,249 @@
+#!/usr/bin/env python3 -i
+# Copyright 2022, The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import re
+from dataclasses import dataclass, field
+from fnmatch import fnmatch, fnmatchcase
+from typing import IO, Iterable, List, Optional
+
+from .inventory_data import ExtensionEntry
+
+# Top-level keys of interest, as they appear before the (large) extension/component arrays.
+_RE_HEADER_END = re.compile(r'"(?:extensions|components)"\s*:')
+_RE_HEADER_VENDOR = re.compile(r'"vendor"\s*:\s*("(?:[^"\\]|\\.)*")')
+_RE_HEADER_PLATFORM = re.compile(r'"platform"\s*:\s*("(?:[^"\\]|\\.)*"|\[[^\]]*\])')
+_RE_HEADER_PLATFORMS = re.compile(r'"platforms"\s*:\s*(\[[^\]]*\])')
+
+HEADER_READ_SIZE = 4096
+"""Number of characters read from an inventory file before scanning its header."""
+
+
+@dataclass
+class InventoryHeader:
+    """The few top-level properties of an inventory file needed to decide whether to load it."""
+
+    vendor: str
+    """The vendor's name"""
+
+    platforms: Optional[List[str]]
+    """The platform(s) listed in the file, or None if they were not found in the header"""
+
+
+def scan_header(text: str) -> Optional[InventoryHeader]:
+    """
+    Cheaply extract the vendor and platform(s) from the text of an inventory JSON file.
+
+    Only the part of the file before the "extensions"/"components" array is examined,
+    so this avoids parsing the bulk of the file.
+    Returns None if the header could not be recognized, in which case the file should
+    be fully parsed instead.
+    """
+    end = _RE_HEADER_END.search(text)
+    header = text[: end.start()] if end else text
+
+    vendor_match = _RE_HEADER_VENDOR.search(header)
+    if not vendor_match:
+        return None
+    try:
+        vendor = json.loads(vendor_match.group(1))
+        platforms = None
+        platform_match = _RE_HEADER_PLATFORMS.search(header) or _RE_HEADER_PLATFORM.search(header)
+        if platform_match:
+            platforms = json.loads(platform_match.group(1))
+            if isinstance(platforms, str):
+                platforms = [platforms]
+    except json.JSONDecodeError:
+        return None
+    return InventoryHeader(vendor=vendor, platforms=platforms)
+
+
+def read_header_text(fp: IO[str]) -> str:
+    """
+    Read the beginning of an inventory file, enough to pass to scan_header.
+
+    Only the first HEADER_READ_SIZE characters are read, unless the end of the header
+    is not found in them, in which case the rest of the file is read as well.
+    The caller should read the rest of the file if it decides to parse it.
+    """
+    text = fp.read(HEADER_READ_SIZE)
+    if not _RE_HEADER_END.search(text):
+        text += fp.read()
+    return text
+
+
+def _matches_any(value: str, patterns: List[str]) -> bool:
+    """Case-insensitive glob match of value against any of the patterns."""
+    return any(fnmatch(value.lower(), pattern.lower()) for pattern in patterns)
+
+
+@dataclass
+class InventoryFilter:
+    """
+    Criteria selecting a subset of the inventory.
+
+    Each non-empty criterion must be satisfied for an entry to be kept;
+    within a criterion, matching any one of the values is enough.
+    An empty filter keeps everything.
+    """
+
+    vendors: List[str] = field(default_factory=list)
+    """Glob patterns (case-insensitive) for the vendor's name"""
+
+    platforms: List[str] = field(default_factory=list)
+    """Glob patterns (case-insensitive) for the platform, e.g. 'Android*'"""
+
+    stubs: List[str] = field(default_factory=list)
+    """Glob patterns for the stub, i.e. the inventory file name stem"""
+
+    categories: List[int] = field(default_factory=list)
+    """Extension categories to keep, as values of ExtensionCategory"""
+
+    def is_empty(self) -> bool:
+        return not (self.vendors or self.platforms or self.stubs or self.categories)
+
+    def matches_stub(self, stub: str) -> bool:
+        """Check the stub alone, usable before even opening the file."""
+        return not self.stubs or any(fnmatchcase(stub, pattern) for pattern in self.stubs)
+
+    def matches(self, stub: str, vendor: str, platforms: Iterable[str]) -> bool:
+        """Check whether an entry with the given stub, vendor and platform(s) is selected."""
+        if not self.matches_stub(stub):
+            return False
+        if self.vendors and not _matches_any(vendor, self.vendors):
+            return False
+        if self.platforms and not any(_matches_any(p, self.platforms) for p in platforms):
+            return False
+        return True
+
+    def rejects_header(self, stub: str, header: Optional[InventoryHeader]) -> bool:
+        """
+        Return True if the file can be skipped based on its header alone.
+
+        Returns False whenever the header is inconclusive, so the file gets fully parsed.
+        """
+        if not self.matches_stub(stub):
+            return True
+        if header is None:
+            return False
+        if self.vendors and not _matches_any(header.vendor, self.vendors):
+            return True
+        if self.platforms and header.platforms is not None:
+            return not any(_matches_any(p, self.platforms) for p in header.platforms)
+        return False
+
+    def filter_extensions(self, extensions: List[ExtensionEntry]) -> List[ExtensionEntry]:
+        """Keep only the extensions belonging to the selected categories."""
+        if not self.categories:
+            return extensions
+
+        # Imported here to avoid a circular import
+        from .extensions import categorize_ext_name
+
+        return [ext for ext in extensions if categorize_ext_name(ext.name) in self.categories]
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "InventoryFilter":
+        """
+        Create a filter from a compact textual description.
+
+        The spec is a ';'-separated list of 'key=value' items, with keys
+        'vendor', 'platform', 'stub' and 'category' (KHR, EXT, VENDOR, KHX, EXTX or VENDORX).
+        Keys may be repeated, e.g. 'platform=Android*;category=KHR;category=EXT'.
+        """
+        result = cls()
+        for item in spec.split(";"):
+            item = item.strip()
+            if not item:
+                continue
+            key, sep, value = item.partition("=")
+            key = key.strip()
+            value = value.strip()
+            if not sep or not value:
+                raise ValueError("Invalid filter item '%s', expected key=value" % item)
+            if key == "vendor":
+                result.vendors.append(value)
+            elif key == "platform":
+                result.platforms.append(value)
+            elif key == "stub":
+                result.stubs.append(value)
+            elif key == "category":
+                result.categories.append(parse_category(value))
+            else:
+                raise ValueError("Unknown filter key '%s'" % key)
+        return result
+
+
+def parse_category(name: str) -> int:
+    """Turn an extension category name such as 'KHR' or 'vendorx' into an ExtensionCategory value."""
+    # Imported here to avoid a circular import
+    from .extensions import ExtensionCategory
+
+    value = getattr(ExtensionCategory, name.upper(), None)
+    if not isinstance(value, int):
+        raise ValueError("Unknown extension category '%s'" % name)
+    return value
+
+
+def _check_inventory_headers() -> List[str]:
+    """
+    Check that scan_header agrees with the full parse for every inventory file.
+
+    Returns a list of error messages, empty if all files agree.
+    """
+    from pathlib import Path
+
+    errors = []
+    root = Path(__file__).parent.parent
+    for directory, platform_keys in (("runtimes", ("platform",)), ("clients", ("platforms", "platform"))):
+        for f in sorted((root / directory).glob("*.json")):
+            with open(f, "r", encoding="utf-8") as fp:
+                header = scan_header(read_header_text(fp))
+                fp.seek(0)
+                data = json.load(fp)
+
+            platforms = None
+            for key in platform_keys:
+                if key in data:
+                    platforms = data[key]
+                    break
+            if isinstance(platforms, str):
+                platforms = [platforms]
+
+            if header is None:
+                errors.append("%s: header not recognized" % f)
+            elif header.vendor != data.get("vendor"):
+                errors.append("%s: scanned vendor %r, parsed %r" % (f, header.vendor, data.get("vendor")))
+            elif header.platforms != platforms:
+                errors.append("%s: scanned platforms %r, parsed %r" % (f, header.platforms, platforms))
+    return errors
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Glob and category semantics
+    from .extensions import ExtensionCategory
+
+    spec = InventoryFilter.from_spec("vendor=meta*;platform=Android*;stub=meta_quest_*;category=KHR;category=ext")
+    assert spec.vendors == ["meta*"]
+    assert spec.categories == [ExtensionCategory.KHR, ExtensionCategory.EXT]
+    assert spec.matches("meta_quest_3_mobile", "Meta Platforms", ["Android (All-in-one)"])
+    assert not spec.matches("Meta_Quest_3_mobile", "Meta Platforms", ["Android (All-in-one)"])
+    assert not spec.matches("meta_quest_3_mobile", "Meta Platforms", ["Windows (Desktop)"])
+    assert not spec.matches("meta_quest_3_mobile", "Meta Platforms", [])
+    assert not spec.matches("meta_quest_3_mobile", "Valve", ["Android (All-in-one)"])
+    exts = [ExtensionEntry(name=n) for n in ("XR_KHR_a", "XR_EXT_b", "XR_META_c", "XR_EXTX_d")]
+    assert [e.name for e in spec.filter_extensions(exts)] == ["XR_KHR_a", "XR_EXT_b"]
+    assert InventoryFilter().is_empty()
+    assert InventoryFilter().filter_extensions(exts) == exts
+
+    # Header scanning of the actual inventory
+    errors = _check_inventory_headers()
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit(1)
+    print("All inventory file headers agree with their parsed contents")
@@ -4,11 +4,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
 from .inventory_data import ExtensionEntry, EnvironmentBlendModeEntry, ViewConfigurationEntry, FormFactorEntry
+from .inventory_filter import InventoryFilter, read_header_text, scan_header
 
 @dataclass(order=True)
 class RuntimeData:
@@ -32,6 +33,9 @@ class RuntimeData:
     vendor: str
     """The vendor's name"""
 
+    platform: Optional[str]
+    """The platform this runtime inventory file describes"""
+
     extensions: List[ExtensionEntry]
     """The supported extensions"""
 
@@ -76,25 +80,66 @@ class RuntimeData:
             conformance_notes=d.get("conformance_notes"),
             devices_notes=d.get("devices_notes"),
             vendor=d["vendor"],
+            platform=d.get("platform"),
             extensions=exts,
             form_factors=form_factors,
         )
 
 
-def load_all_runtimes(directory=None) -> List[RuntimeData]:
-    """Load all runtime inventory files."""
+def _filter_runtime(runtime: RuntimeData, inventory_filter: InventoryFilter) -> Optional[RuntimeData]:
+    """Return the runtime restricted to the filter, or None if it is filtered out entirely."""
+    platforms = [runtime.platform] if runtime.platform else []
+    if not inventory_filter.matches(runtime.stub, runtime.vendor, platforms):
+        return None
+    if not inventory_filter.categories:
+        return runtime
+    return replace(runtime, extensions=inventory_filter.filter_extensions(runtime.extensions))
+
+
+def filter_runtimes(runtimes: List[RuntimeData], inventory_filter: InventoryFilter) -> List[RuntimeData]:
+    """
+    Select the subset of already-loaded runtimes matching a filter.
+
+    Use this to derive several report variants from a single load.
+    """
+    results = []
+    for runtime in runtimes:
+        filtered = _filter_runtime(runtime, inventory_filter)
+        if filtered is not None:
+            results.append(filtered)
+    return results
+
+
+def load_all_runtimes(directory=None, inventory_filter: Optional[InventoryFilter] = None) -> List[RuntimeData]:
+    """
+    Load all runtime inventory files.
+
+    If 'inventory_filter' is given, files it excludes are skipped based on a scan of
+    their first few KB where possible, without being fully read or parsed.
+    """
     if not directory:
         directory = Path(__file__).parent.parent / "runtimes"
+    if inventory_filter is not None and inventory_filter.is_empty():
+        inventory_filter = None
 
     failures = []
     results = []
     for f in directory.glob("*.json"):
+        if inventory_filter and not inventory_filter.matches_stub(f.stem):
+            print("Skipped %s" % f.stem)
+            continue
         with open(f, "r", encoding="utf-8") as fp:
-            data = json.load(fp)
+            if inventory_filter:
+                text = read_header_text(fp)
+                if inventory_filter.rejects_header(f.stem, scan_header(text)):
+                    print("Skipped %s" % f.stem)
+                    continue
+                text += fp.read()
+            else:
+                text = fp.read()
+        data = json.loads(text)
         try:
             parsed = RuntimeData.from_json(f.stem, data)
-            results.append(parsed)
-            print("Loaded %s" % parsed.stub)
         except KeyError as e:
             print(
                 "Error loading %s (probably missing required property), skipping..."
@@ -102,6 +147,14 @@ def load_all_runtimes(directory=None) -> List[RuntimeData]:
             )
             print(e)
             failures.append(str(f))
+            continue
+        if inventory_filter:
+            parsed = _filter_runtime(parsed, inventory_filter)
+            if parsed is None:
+                print("Skipped %s" % f.stem)
+                continue
+        results.append(parsed)
+        print("Loaded %s" % parsed.stub)
     if failures:
         print(failures)
         raise RuntimeError(